@@ -7,15 +7,70 @@ For: Relinns Technologies Assessment
 ==============================================
 """
 
+import hashlib
+import json
+import os
+import shutil
+import threading
+
+# CPU threading defaults for torch/OpenMP/MKL; these are read when torch is
+# imported, so they must be set first. A model this small gains little past
+# ~8 intra-op threads, and more threads oversubscribe large hosts.
+os.environ.setdefault('OMP_NUM_THREADS', str(min(8, os.cpu_count() or 4)))
+os.environ.setdefault('MKL_NUM_THREADS', os.environ['OMP_NUM_THREADS'])
+os.environ.setdefault('KMP_AFFINITY', 'granularity=fine,compact,1,0')
+
 import streamlit as st
 import requests
 from bs4 import BeautifulSoup
-import re
-from transformers import pipeline
+from requests.adapters import HTTPAdapter
+from urllib3.util.request import ACCEPT_ENCODING
 import warnings
 
 warnings.filterwarnings('ignore')
 
+# Maximum number of characters of website content passed to the model
+MAX_CONTENT_LENGTH = 2000
+
+# Maximum number of bytes of HTML downloaded per page; far more than needed
+# for MAX_CONTENT_LENGTH characters of text, and bounds memory/parse work
+MAX_RESPONSE_BYTES = 2 * 1024 * 1024
+
+# Model configuration
+# flan-t5-small (77M params) is ~3x faster than flan-t5-base (250M) on CPU;
+# set WW_MODEL=google/flan-t5-base or google/flan-t5-large for better answers
+MODEL_NAME = os.environ.get('WW_MODEL', 'google/flan-t5-small')
+# Inference backend: 'onnx' (int8-quantized ONNX Runtime), 'ctranslate2'
+# (int8 CTranslate2) or 'torch' (fp32 PyTorch)
+MODEL_BACKEND = os.environ.get('WW_BACKEND', 'onnx').lower()
+# Directory where exported/quantized models are kept between runs
+MODEL_CACHE_DIR = os.environ.get(
+    'WW_CACHE_DIR', os.path.join(os.path.expanduser('~'), '.cache', 'webwhisper')
+)
+
+# Semantic answer cache: questions about the same website whose embeddings
+# have cosine similarity >= SEMANTIC_CACHE_THRESHOLD share one answer
+EMBEDDING_MODEL_NAME = 'sentence-transformers/all-MiniLM-L6-v2'
+SEMANTIC_CACHE_THRESHOLD = 0.92
+SEMANTIC_CACHE_MAX_ENTRIES = 256
+SEMANTIC_CACHE_MAX_WEBSITES = 32
+
+# Example questions shown in the UI; their answers are precomputed in one
+# batch when a website is loaded
+EXAMPLE_QUESTIONS = [
+    ("🔍", "What is this website about?"),
+    ("📋", "What services are offered?"),
+    ("⭐", "What are the main features?"),
+    ("💼", "Who is the target audience?"),
+    ("🎯", "What problems does it solve?"),
+]
+
+# Chat avatars for st.chat_message()
+CHAT_AVATARS = {"user": "👤", "assistant": "🔮"}
+
+# ONNX graphs exported for a seq2seq model, quantized one by one
+ONNX_MODEL_FILES = ['encoder_model.onnx', 'decoder_model.onnx', 'decoder_with_past_model.onnx']
+
 # Page configuration
 st.set_page_config(
     page_title="WebWhisper AI - Intelligent Website Chatbot",
@@ -24,83 +79,162 @@ st.set_page_config(
 )
 
 # Custom CSS for better styling
-st.markdown("""
-    <style>
-    .main-header {
-        font-size: 3rem;
-        background: linear-gradient(120deg, #1f77b4, #8e44ad);
-        -webkit-background-clip: text;
-        -webkit-text-fill-color: transparent;
-        text-align: center;
-        padding: 1rem 0;
-        font-weight: bold;
-    }
-    .tagline {
-        text-align: center;
-        color: #666;
-        font-size: 1.2rem;
-        margin-bottom: 2rem;
-        font-style: italic;
-    }
-    .chat-message {
-        padding: 1rem;
-        border-radius: 0.5rem;
-        margin-bottom: 1rem;
-        animation: fadeIn 0.5s;
-    }
-    @keyframes fadeIn {
-        from { opacity: 0; transform: translateY(10px); }
-        to { opacity: 1; transform: translateY(0); }
-    }
-    .user-message {
-        background-color: #e3f2fd;
-        border-left: 4px solid #2196f3;
-    }
-    .bot-message {
-        background-color: #f1f8e9;
-        border-left: 4px solid #8bc34a;
-    }
-    .info-box {
-        background-color: #fff3e0;
-        padding: 1.5rem;
-        border-radius: 0.5rem;
-        border-left: 4px solid #ff9800;
-        margin: 1rem 0;
-    }
-    .feature-card {
-        background-color: #f5f5f5;
-        padding: 1rem;
-        border-radius: 0.5rem;
-        margin: 0.5rem 0;
-        border-left: 3px solid #1f77b4;
-    }
-    .stats-box {
-        background-color: #e8f5e9;
-        padding: 1rem;
-        border-radius: 0.5rem;
-        text-align: center;
-        margin: 0.5rem 0;
-    }
-    </style>
-""", unsafe_allow_html=True)
+CUSTOM_CSS = """
+<style>
+.main-header {
+    font-size: 3rem;
+    background: linear-gradient(120deg, #1f77b4, #8e44ad);
+    -webkit-background-clip: text;
+    -webkit-text-fill-color: transparent;
+    text-align: center;
+    padding: 1rem 0;
+    font-weight: bold;
+}
+.tagline {
+    text-align: center;
+    color: #666;
+    font-size: 1.2rem;
+    margin-bottom: 2rem;
+    font-style: italic;
+}
+.info-box {
+    background-color: #fff3e0;
+    padding: 1.5rem;
+    border-radius: 0.5rem;
+    border-left: 4px solid #ff9800;
+    margin: 1rem 0;
+}
+.feature-card {
+    background-color: #f5f5f5;
+    padding: 1rem;
+    border-radius: 0.5rem;
+    margin: 0.5rem 0;
+    border-left: 3px solid #1f77b4;
+}
+.stats-box {
+    background-color: #e8f5e9;
+    padding: 1rem;
+    border-radius: 0.5rem;
+    text-align: center;
+    margin: 0.5rem 0;
+}
+</style>
+"""
+
+# Static HTML blocks. Each one is emitted with a single st.markdown() call,
+# since every call is a separate render on each rerun. Kept flush-left so
+# Markdown doesn't treat indented HTML as a code block.
+HEADER_HTML = """
+<h1 class="main-header">🔮 WebWhisper AI</h1>
+<p class="tagline">✨ Whispers insights from any website ✨</p>
+"""
+
+FEATURES_HTML = """
+### ✨ Features
+
+<div class="feature-card">
+    🔍 <strong>Smart Scraping</strong><br>
+    <small>Extracts key content from any website</small>
+</div>
+<div class="feature-card">
+    🤖 <strong>AI-Powered</strong><br>
+    <small>Uses FLAN-T5 NLP model</small>
+</div>
+<div class="feature-card">
+    💬 <strong>Natural Chat</strong><br>
+    <small>Conversational Q&A interface</small>
+</div>
+<div class="feature-card">
+    ⚡ <strong>Real-time</strong><br>
+    <small>Instant answers to your questions</small>
+</div>
+"""
+
+GET_STARTED_HTML = """
+<div class="info-box">
+    <h3>🚀 How to Get Started</h3>
+    <ol>
+        <li><strong>Enter URL:</strong> Paste a website URL in the sidebar</li>
+        <li><strong>Analyze:</strong> Click "Analyze Website" button</li>
+        <li><strong>Chat:</strong> Ask questions about the content!</li>
+    </ol>
+    <p><em>WebWhisper will extract and understand the website content for you.</em></p>
+</div>
+
+### 💡 Example Questions
+
+""" + "\n".join(f"- {icon} {question}" for icon, question in EXAMPLE_QUESTIONS)
+
+WELCOME_HTML = """
+<div class="info-box" style="background-color: #e8f5e9; border-left-color: #4caf50;">
+    <h3>🎯 Why WebWhisper AI?</h3>
+    <ul>
+        <li><strong>Instant Understanding:</strong> Quickly grasp website content</li>
+        <li><strong>Smart Analysis:</strong> AI-powered insights</li>
+        <li><strong>Save Time:</strong> No need to read entire websites</li>
+        <li><strong>Ask Anything:</strong> Natural language Q&A</li>
+    </ul>
+</div>
+"""
+
+STACK_HTML = """
+<div class="info-box" style="background-color: #e3f2fd; border-left-color: #2196f3;">
+    <h3>🔧 Technical Stack</h3>
+    <ul>
+        <li>🤖 <strong>NLP:</strong> FLAN-T5 (Hugging Face)</li>
+        <li>🕷️ <strong>Scraping:</strong> BeautifulSoup4</li>
+        <li>🎨 <strong>Interface:</strong> Streamlit</li>
+        <li>🐍 <strong>Language:</strong> Python 3.8+</li>
+    </ul>
+</div>
+"""
+
+st.markdown(CUSTOM_CSS, unsafe_allow_html=True)
+
+
+@st.cache_resource
+def get_http_session():
+    """Shared HTTP session (cached so pooled connections survive reruns)."""
+    # Advertise every compression scheme urllib3 can decode (br/zstd when
+    # the optional brotli/zstandard packages are installed)
+    session = requests.Session()
+    session.headers.update({
+        'Accept-Encoding': ACCEPT_ENCODING,
+        'User-Agent': 'WebWhisperAI/1.0'
+    })
+    session.mount('http://', HTTPAdapter(pool_connections=4, pool_maxsize=8))
+    session.mount('https://', HTTPAdapter(pool_connections=4, pool_maxsize=8))
+    return session
 
 
 def scrape_website(url):
     """Scrape website content and extract readable text."""
     try:
-        with st.spinner(f"🔍 WebWhisper is analyzing {url}..."):
-            response = requests.get(url, timeout=10)
+        # Stream the body, capped at MAX_RESPONSE_BYTES
+        with get_http_session().get(url, timeout=10, stream=True) as response:
             response.raise_for_status()
             
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # Remove unwanted elements
-            for element in soup(['script', 'style', 'nav', 'footer', 'header']):
-                element.decompose()
-            
-            text = soup.get_text()
-            return text, None
-            
+            chunks = []
+            total = 0
+            for chunk in response.iter_content(chunk_size=65536):
+                chunks.append(chunk)
+                total += len(chunk)
+                if total >= MAX_RESPONSE_BYTES:
+                    break
+            body = b''.join(chunks)
+        
+        soup = BeautifulSoup(body, 'lxml')
+        
+        # Remove unwanted elements
+        for element in soup.select('script, style, nav, footer, header'):
+            element.extract()
+        
+        text = soup.get_text(separator=' ', strip=True)
+        
+        # Bound raw text before cleaning (slack for whitespace collapse)
+        text = text[:MAX_CONTENT_LENGTH * 8]
+        return text, None
+        
     except requests.exceptions.RequestException as e:
         return None, f"Error fetching website: {e}"
     except Exception as e:
@@ -112,64 +246,521 @@ def clean_text(text):
     if not text:
         return ""
     
-    text = re.sub(r'\s+', ' ', text)
-    text = text.strip()
+    text = ' '.join(text.split())
     
-    max_length = 2000
-    if len(text) > max_length:
-        text = text[:max_length] + "..."
+    if len(text) > MAX_CONTENT_LENGTH:
+        text = text[:MAX_CONTENT_LENGTH] + "..."
     
     return text
 
 
+def load_onnx_int8_model(model_name):
+    """Load an int8-quantized ONNX Runtime model, exporting it on first use."""
+    import onnxruntime
+    from optimum.onnxruntime import ORTModelForSeq2SeqLM, ORTQuantizer
+    from optimum.onnxruntime.configuration import AutoQuantizationConfig
+    from transformers import AutoTokenizer
+    
+    quantized_dir = os.path.join(MODEL_CACHE_DIR, model_name.replace('/', '--') + '-onnx-int8')
+    
+    if not os.path.isdir(quantized_dir):
+        export_dir = quantized_dir + '-export'
+        staging_dir = quantized_dir + '-tmp'
+        
+        try:
+            ORTModelForSeq2SeqLM.from_pretrained(model_name, export=True).save_pretrained(export_dir)
+            AutoTokenizer.from_pretrained(model_name).save_pretrained(export_dir)
+            
+            # Dynamic int8 quantization of encoder and both decoder graphs
+            qconfig = AutoQuantizationConfig.avx512_vnni(is_static=False, per_channel=True)
+            for file_name in ONNX_MODEL_FILES:
+                quantizer = ORTQuantizer.from_pretrained(export_dir, file_name=file_name)
+                quantizer.quantize(save_dir=staging_dir, quantization_config=qconfig)
+            
+            for file_name in os.listdir(export_dir):
+                if not file_name.endswith('.onnx'):
+                    shutil.copy(os.path.join(export_dir, file_name), staging_dir)
+            
+            # Publish in one step so an interrupted export is never reused
+            os.replace(staging_dir, quantized_dir)
+        finally:
+            # Also clears half-written directories when export fails
+            shutil.rmtree(export_dir, ignore_errors=True)
+            shutil.rmtree(staging_dir, ignore_errors=True)
+    
+    # Match the thread budget used by the other backends
+    session_options = onnxruntime.SessionOptions()
+    session_options.intra_op_num_threads = int(os.environ['OMP_NUM_THREADS'])
+    session_options.inter_op_num_threads = 1
+    
+    model = ORTModelForSeq2SeqLM.from_pretrained(
+        quantized_dir,
+        encoder_file_name='encoder_model_quantized.onnx',
+        decoder_file_name='decoder_model_quantized.onnx',
+        decoder_with_past_file_name='decoder_with_past_model_quantized.onnx',
+        session_options=session_options
+    )
+    tokenizer = AutoTokenizer.from_pretrained(quantized_dir)
+    return model, tokenizer
+
+
+class CTranslate2Model:
+    """Minimal generate()-compatible wrapper around a CTranslate2 int8 translator."""
+    
+    def __init__(self, translator, tokenizer):
+        self.translator = translator
+        self.tokenizer = tokenizer
+    
+    def generate(self, input_ids, attention_mask=None, max_new_tokens=150,
+                 min_new_tokens=0, streamer=None, **kwargs):
+        rows = input_ids.tolist()
+        masks = attention_mask.tolist() if attention_mask is not None else [[1] * len(row) for row in rows]
+        
+        # CTranslate2 works on unpadded token strings rather than ids
+        source_tokens = [
+            self.tokenizer.convert_ids_to_tokens([t for t, keep in zip(row, mask) if keep])
+            for row, mask in zip(rows, masks)
+        ]
+        
+        if streamer is not None:
+            import torch
+            
+            # Stream a single prompt token by token; the first put() is the
+            # decoder start token, which skip_prompt streamers drop
+            streamer.put(torch.tensor([self.tokenizer.pad_token_id]))
+            token_ids = []
+            for step in self.translator.generate_tokens(
+                source_tokens[0],
+                max_decoding_length=max_new_tokens,
+                min_decoding_length=min_new_tokens
+            ):
+                token_ids.append(step.token_id)
+                streamer.put(torch.tensor([step.token_id]))
+            streamer.end()
+            return [token_ids]
+        
+        results = self.translator.translate_batch(
+            source_tokens,
+            beam_size=1,
+            max_decoding_length=max_new_tokens,
+            min_decoding_length=min_new_tokens
+        )
+        
+        return [self.tokenizer.convert_tokens_to_ids(result.hypotheses[0]) for result in results]
+
+
+def load_ctranslate2_model(model_name):
+    """Load an int8 CTranslate2 model, converting it on first use."""
+    import ctranslate2
+    from transformers import AutoTokenizer
+    
+    converted_dir = os.path.join(MODEL_CACHE_DIR, model_name.replace('/', '--') + '-ct2-int8')
+    
+    if not os.path.isdir(converted_dir):
+        converter = ctranslate2.converters.TransformersConverter(model_name)
+        converter.convert(converted_dir + '-tmp', quantization='int8', force=True)
+        os.replace(converted_dir + '-tmp', converted_dir)
+    
+    translator = ctranslate2.Translator(
+        converted_dir,
+        device='cpu',
+        compute_type='int8',
+        inter_threads=1,
+        intra_threads=int(os.environ['OMP_NUM_THREADS'])
+    )
+    tokenizer = AutoTokenizer.from_pretrained(model_name)
+    return CTranslate2Model(translator, tokenizer), tokenizer
+
+
+def configure_torch_threads():
+    """Configure torch CPU threads (OMP_NUM_THREADS intra-op, 1 inter-op) and oneDNN."""
+    import torch
+    
+    torch.set_num_threads(int(os.environ['OMP_NUM_THREADS']))
+    try:
+        torch.set_num_interop_threads(1)
+    except RuntimeError:
+        pass  # Can only be set once, before any parallel work has started
+    
+    torch.backends.mkldnn.enabled = True
+    if hasattr(torch.jit, 'enable_onednn_fusion'):
+        torch.jit.enable_onednn_fusion(True)
+
+
+@st.cache_data(ttl=3600, max_entries=32, show_spinner=False)
+def fetch_and_clean(url):
+    """Scrape and clean a website (cached per URL for an hour)."""
+    raw_text, error = scrape_website(url)
+    if error:
+        # Raising keeps failures out of the cache, so a retry refetches
+        raise RuntimeError(error)
+    return clean_text(raw_text)
+
+
+def cpu_supports_bf16():
+    """Check whether the CPU has native (AVX-512-BF16) bfloat16 support."""
+    import torch
+    
+    is_supported = getattr(torch.cpu, '_is_avx512_bf16_supported', None)
+    return bool(is_supported and is_supported())
+
+
 @st.cache_resource
 def load_model():
-    """Load the Hugging Face model (cached for performance)."""
+    """Load the model and tokenizer (cached); returns (model, tokenizer, error, warning)."""
     try:
-        model_pipeline = pipeline(
-            "text2text-generation",
-            model="google/flan-t5-base",
-            device=-1
-        )
-        return model_pipeline, None
+        # Heavy imports are deferred until the model is actually needed
+        import torch
+        from transformers import AutoModelForSeq2SeqLM, AutoTokenizer
+        
+        configure_torch_threads()
+        
+        if MODEL_BACKEND == 'ctranslate2':
+            return (*load_ctranslate2_model(MODEL_NAME), None, None)
+        
+        warning = None
+        if MODEL_BACKEND == 'onnx':
+            try:
+                return (*load_onnx_int8_model(MODEL_NAME), None, None)
+            except ImportError:
+                pass  # optimum[onnxruntime] not installed, use PyTorch
+            except Exception as e:
+                # Export, quantization or cache-dir failures: fp32 still works
+                warning = f"ONNX backend failed ({e}), using PyTorch backend."
+        
+        model = AutoModelForSeq2SeqLM.from_pretrained(MODEL_NAME)
+        model.eval()
+        
+        # Native bf16 is ~2x fp32 throughput; never fp16, which breaks T5
+        if cpu_supports_bf16():
+            model = model.to(torch.bfloat16)
+        tokenizer = AutoTokenizer.from_pretrained(MODEL_NAME)
+        return model, tokenizer, None, warning
     except Exception as e:
-        return None, f"Error loading model: {e}"
+        return None, None, f"Error loading model: {e}", None
 
 
-def ask_model(question, context, model_pipeline):
-    """Generate answer using Hugging Face model."""
+class SemanticCache:
+    """
+    Answer cache keyed by question meaning, with one FAISS index per website.
+    
+    Questions whose sentence embeddings have cosine similarity of at least
+    SEMANTIC_CACHE_THRESHOLD share an answer. Stores are keyed on model,
+    backend and prompt prefix (the page content), LRU-capped at
+    SEMANTIC_CACHE_MAX_ENTRIES and persisted so app restarts keep the cache.
+    The instance is shared by all sessions, so access is locked.
+    """
+    
+    def __init__(self, embedder):
+        self.embedder = embedder
+        self.cache_dir = os.path.join(MODEL_CACHE_DIR, 'semantic-cache')
+        self._stores = {}
+        # Shared by every session via cache_resource; guards stores and files
+        self._lock = threading.Lock()
+    
+    def _key(self, prefix_ids):
+        digest = hashlib.sha1(f"{MODEL_NAME}|{MODEL_BACKEND}|".encode('utf-8'))
+        digest.update(json.dumps(prefix_ids).encode('utf-8'))
+        return digest.hexdigest()
+    
+    def _store(self, key):
+        if key in self._stores:
+            # Re-insert so dict order tracks recency for the eviction below
+            self._stores[key] = self._stores.pop(key)
+            return self._stores[key]
+        
+        import faiss
+        
+        path = os.path.join(self.cache_dir, key)
+        index, answers = None, []
+        if os.path.exists(path + '.index'):
+            try:
+                index = faiss.read_index(path + '.index')
+                with open(path + '.json', encoding='utf-8') as f:
+                    answers = json.load(f)
+                if index.ntotal != len(answers):
+                    raise ValueError("index and answers are out of sync")
+            except Exception:
+                # Corrupt or partial cache files: treat as a miss and rebuild
+                index, answers = None, []
+        if index is None:
+            index = faiss.IndexFlatIP(self.embedder.get_sentence_embedding_dimension())
+        
+        # Bound memory to the most recently used websites
+        if len(self._stores) >= SEMANTIC_CACHE_MAX_WEBSITES:
+            self._stores.pop(next(iter(self._stores)))
+        
+        store = {
+            'index': index,
+            'answers': answers,
+            'last_used': list(range(len(answers))),
+            'clock': len(answers)
+        }
+        self._stores[key] = store
+        return store
+    
+    def _save(self, key, store):
+        import faiss
+        
+        path = os.path.join(self.cache_dir, key)
+        tmp_suffix = f'.{os.getpid()}.tmp'
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            
+            # Write temp files and swap them in, so a crash mid-write never
+            # leaves a truncated file behind
+            faiss.write_index(store['index'], path + '.index' + tmp_suffix)
+            with open(path + '.json' + tmp_suffix, 'w', encoding='utf-8') as f:
+                json.dump(store['answers'], f)
+            os.replace(path + '.index' + tmp_suffix, path + '.index')
+            os.replace(path + '.json' + tmp_suffix, path + '.json')
+            self._prune()
+        except (OSError, RuntimeError):
+            pass  # Persistence is best-effort; the in-memory cache still works
+    
+    def _prune(self):
+        # Content keys change whenever a page does, so keep only the most
+        # recently written SEMANTIC_CACHE_MAX_WEBSITES stores on disk
+        index_files = [
+            os.path.join(self.cache_dir, name)
+            for name in os.listdir(self.cache_dir) if name.endswith('.index')
+        ]
+        index_files.sort(key=os.path.getmtime, reverse=True)
+        for index_file in index_files[SEMANTIC_CACHE_MAX_WEBSITES:]:
+            base = index_file[:-len('.index')]
+            for stale in (index_file, base + '.json'):
+                try:
+                    os.remove(stale)
+                except FileNotFoundError:
+                    pass
+    
+    def lookup(self, prefix_ids, question):
+        """Return (cached answer or None, question embedding for add())."""
+        embedding = self.embedder.encode(
+            [question], normalize_embeddings=True, convert_to_numpy=True
+        ).astype('float32')
+        
+        with self._lock:
+            store = self._store(self._key(prefix_ids))
+            if store['index'].ntotal:
+                scores, ids = store['index'].search(embedding, 1)
+                if scores[0][0] >= SEMANTIC_CACHE_THRESHOLD:
+                    i = int(ids[0][0])
+                    store['clock'] += 1
+                    store['last_used'][i] = store['clock']
+                    return store['answers'][i], embedding
+        
+        return None, embedding
+    
+    def add(self, prefix_ids, embedding, answer):
+        """Store an answer under a question embedding returned by lookup()."""
+        import numpy as np
+        
+        with self._lock:
+            key = self._key(prefix_ids)
+            store = self._store(key)
+            
+            # Evict the least recently used entry once the index is full
+            if len(store['answers']) >= SEMANTIC_CACHE_MAX_ENTRIES:
+                oldest = store['last_used'].index(min(store['last_used']))
+                store['index'].remove_ids(np.array([oldest], dtype='int64'))
+                del store['answers'][oldest]
+                del store['last_used'][oldest]
+            
+            store['index'].add(embedding)
+            store['answers'].append(answer)
+            store['clock'] += 1
+            store['last_used'].append(store['clock'])
+            self._save(key, store)
+
+
+@st.cache_resource
+def load_semantic_cache():
+    """Load the semantic answer cache; returns (cache or None, error)."""
     try:
-        prompt = f"""Based on the following website content, answer the question.
+        import faiss  # noqa: F401
+        from sentence_transformers import SentenceTransformer
+    except ImportError:
+        return None, None
+    
+    # Any failure (offline, hub error, disk full) just disables the cache;
+    # returning instead of raising lets cache_resource remember that
+    try:
+        return SemanticCache(SentenceTransformer(EMBEDDING_MODEL_NAME, device='cpu')), None
+    except Exception as e:
+        return None, f"Semantic answer cache disabled: {e}"
+
+
+def encode_context(context, tokenizer):
+    """Tokenize the static prompt prefix once per website."""
+    prefix = f"""Based on the following website content, answer the question.
 
 Website Content:
 {context}
 
-Question: {question}
+Question: """
+    return tokenizer(prefix, add_special_tokens=False).input_ids
 
-Answer:"""
-        
-        response = model_pipeline(
-            prompt,
+
+def ask_model_batch(questions, prefix_ids, model, tokenizer, semantic_cache=None):
+    """Generate answers for several questions with one batched model call; raises on failure."""
+    import torch
+    
+    answers = [None] * len(questions)
+    embeddings = [None] * len(questions)
+    
+    # Reuse answers to earlier, similar questions when possible
+    if semantic_cache is not None:
+        for i, question in enumerate(questions):
+            answers[i], embeddings[i] = semantic_cache.lookup(prefix_ids, question)
+    
+    pending = [i for i, answer in enumerate(answers) if answer is None]
+    if not pending:
+        return answers
+    
+    # Only the question suffix is tokenized per turn; padded batch
+    # amortizes GEMM cost across all prompts
+    suffix_ids = tokenizer([f"{questions[i]}\n\nAnswer:" for i in pending]).input_ids
+    batch = tokenizer.pad(
+        {'input_ids': [prefix_ids + ids for ids in suffix_ids]},
+        return_tensors='pt'
+    )
+    
+    # Greedy decoding with the KV cache, no autograd bookkeeping
+    with torch.inference_mode():
+        output_ids = model.generate(
+            **batch,
             max_new_tokens=150,
             min_new_tokens=20,
-            do_sample=False
+            num_beams=1,
+            do_sample=False,
+            use_cache=True
         )
+    responses = tokenizer.batch_decode(output_ids, skip_special_tokens=True)
+    
+    for i, response in zip(pending, responses):
+        answer = response.strip()
+        
+        if not answer:
+            answers[i] = "I couldn't generate a proper answer. Please try rephrasing your question."
+            continue
         
-        answer = response[0]['generated_text'].strip()
+        answers[i] = answer
+        if semantic_cache is not None:
+            semantic_cache.add(prefix_ids, embeddings[i], answer)
+    
+    return answers
+
+
+def ask_model(question, prefix_ids, model, tokenizer, semantic_cache=None):
+    """Generate answer using Hugging Face model."""
+    try:
+        return ask_model_batch([question], prefix_ids, model, tokenizer, semantic_cache)[0]
+    except Exception as e:
+        return f"Error generating response: {e}"
+
+
+@st.cache_data(max_entries=32, show_spinner=False)
+def answer_example_questions(prefix_ids, _model, _tokenizer, _semantic_cache):
+    """Answer EXAMPLE_QUESTIONS in one batch (cached per website content; failures are not cached)."""
+    example_questions = [question for _, question in EXAMPLE_QUESTIONS]
+    example_answers = ask_model_batch(example_questions, prefix_ids, _model, _tokenizer, _semantic_cache)
+    return dict(zip(example_questions, example_answers))
+
+
+def generate_in_thread(model, streamer, errors, **generation_kwargs):
+    """Run model.generate() feeding a streamer; records failures in errors."""
+    import torch
+    
+    try:
+        # inference_mode is thread-local, so enter it in the worker thread
+        with torch.inference_mode():
+            model.generate(streamer=streamer, **generation_kwargs)
+    except Exception as e:
+        errors.append(e)
+        streamer.end()  # Unblock the consumer
+
+
+def stream_answer(question, prefix_ids, model, tokenizer, semantic_cache=None):
+    """Yield the answer text generated so far, token by token."""
+    import torch
+    from transformers import TextIteratorStreamer
+    
+    try:
+        embedding = None
+        if semantic_cache is not None:
+            cached_answer, embedding = semantic_cache.lookup(prefix_ids, question)
+            if cached_answer is not None:
+                yield cached_answer
+                return
         
+        suffix_ids = tokenizer(f"{question}\n\nAnswer:").input_ids
+        input_ids = torch.tensor([prefix_ids + suffix_ids])
+        streamer = TextIteratorStreamer(tokenizer, skip_prompt=True, skip_special_tokens=True)
+        errors = []
+        
+        # Generation runs in the background while this thread renders tokens
+        thread = threading.Thread(
+            target=generate_in_thread,
+            args=(model, streamer, errors),
+            kwargs=dict(
+                input_ids=input_ids,
+                attention_mask=torch.ones_like(input_ids),
+                max_new_tokens=150,
+                min_new_tokens=20,
+                num_beams=1,
+                do_sample=False,
+                use_cache=True
+            )
+        )
+        thread.start()
+        
+        answer = ""
+        for text in streamer:
+            answer += text
+            yield answer
+        thread.join()
+        
+        if errors:
+            raise errors[0]
+        
+        answer = answer.strip()
         if not answer:
-            return "I couldn't generate a proper answer. Please try rephrasing your question."
+            yield "I couldn't generate a proper answer. Please try rephrasing your question."
+            return
         
-        return answer
+        if semantic_cache is not None:
+            semantic_cache.add(prefix_ids, embedding, answer)
+        yield answer
         
     except Exception as e:
-        return f"Error generating response: {e}"
+        yield f"Error generating response: {e}"
+
+
+def render_stats():
+    """Render the sidebar analysis stats for the loaded website."""
+    st.markdown("### 📊 Analysis Stats")
+    col1, col2 = st.columns(2)
+    with col1:
+        st.markdown(f"""
+        <div class="stats-box">
+            <h3 style="color: #1f77b4; margin: 0;">{len(st.session_state.context)}</h3>
+            <p style="margin: 0; font-size: 0.8rem;">Characters</p>
+        </div>
+        """, unsafe_allow_html=True)
+    with col2:
+        st.markdown(f"""
+        <div class="stats-box">
+            <h3 style="color: #8bc34a; margin: 0;">{len(st.session_state.messages)}</h3>
+            <p style="margin: 0; font-size: 0.8rem;">Messages</p>
+        </div>
+        """, unsafe_allow_html=True)
+    st.markdown("---")
 
 
 def main():
     # Header with branding
-    st.markdown('<h1 class="main-header">🔮 WebWhisper AI</h1>', unsafe_allow_html=True)
-    st.markdown('<p class="tagline">✨ Whispers insights from any website ✨</p>', unsafe_allow_html=True)
+    st.markdown(HEADER_HTML, unsafe_allow_html=True)
     st.markdown("---")
     
     # Sidebar for configuration
@@ -193,46 +784,21 @@ def main():
         
         st.markdown("---")
         
-        # Stats display
-        if 'context' in st.session_state and st.session_state.context:
-            st.markdown("### 📊 Analysis Stats")
-            col1, col2 = st.columns(2)
-            with col1:
-                st.markdown(f"""
-                <div class="stats-box">
-                    <h3 style="color: #1f77b4; margin: 0;">{len(st.session_state.context)}</h3>
-                    <p style="margin: 0; font-size: 0.8rem;">Characters</p>
-                </div>
-                """, unsafe_allow_html=True)
-            with col2:
-                st.markdown(f"""
-                <div class="stats-box">
-                    <h3 style="color: #8bc34a; margin: 0;">{len(st.session_state.messages)}</h3>
-                    <p style="margin: 0; font-size: 0.8rem;">Messages</p>
-                </div>
-                """, unsafe_allow_html=True)
-            st.markdown("---")
+        # Stats are filled in at the end of main(), after this run's messages
+        stats_placeholder = st.empty()
         
         # Features section
-        st.markdown("### ✨ Features")
-        st.markdown("""
-        <div class="feature-card">
-            🔍 <strong>Smart Scraping</strong><br>
-            <small>Extracts key content from any website</small>
-        </div>
-        <div class="feature-card">
-            🤖 <strong>AI-Powered</strong><br>
-            <small>Uses FLAN-T5 NLP model</small>
-        </div>
-        <div class="feature-card">
-            💬 <strong>Natural Chat</strong><br>
-            <small>Conversational Q&A interface</small>
-        </div>
-        <div class="feature-card">
-            ⚡ <strong>Real-time</strong><br>
-            <small>Instant answers to your questions</small>
-        </div>
-        """, unsafe_allow_html=True)
+        st.markdown(FEATURES_HTML, unsafe_allow_html=True)
+        
+        st.markdown("---")
+        st.markdown("### 🧠 Model")
+        st.write(f"`{MODEL_NAME}` ({MODEL_BACKEND})")
+        st.caption(
+            "flan-t5-small answers ~3x faster and uses ~3x less memory than "
+            "flan-t5-base, at some cost in answer quality. Set the WW_MODEL "
+            "environment variable to google/flan-t5-base or flan-t5-large "
+            "for better answers."
+        )
         
         st.markdown("---")
         st.markdown("### 👨‍💻 Developer")
@@ -247,36 +813,72 @@ def main():
         st.session_state.context = None
     if 'model' not in st.session_state:
         st.session_state.model = None
+    if 'tokenizer' not in st.session_state:
+        st.session_state.tokenizer = None
+    if 'semantic_cache' not in st.session_state:
+        st.session_state.semantic_cache = None
+    if 'prefix_ids' not in st.session_state:
+        st.session_state.prefix_ids = None
     if 'url_loaded' not in st.session_state:
         st.session_state.url_loaded = False
+    if 'example_answers' not in st.session_state:
+        st.session_state.example_answers = {}
     
     # Load model (cached)
     if st.session_state.model is None:
         with st.spinner("🔄 Initializing WebWhisper AI (this may take a minute)..."):
-            model, error = load_model()
+            model, tokenizer, error, warning = load_model()
             if error:
                 st.error(f"❌ {error}")
-                st.info("💡 **Tip:** Make sure you have installed: `pip install transformers torch`")
+                st.info("💡 **Tip:** Make sure you have installed: `pip install transformers torch 'optimum[onnxruntime]'`")
                 st.stop()
+            if warning:
+                st.warning(f"⚠️ {warning}")
             st.session_state.model = model
+            st.session_state.tokenizer = tokenizer
+            
+            semantic_cache, cache_error = load_semantic_cache()
+            if cache_error:
+                st.warning(f"⚠️ {cache_error}")
+            st.session_state.semantic_cache = semantic_cache
             st.success("✅ WebWhisper AI is ready!")
     
     # Load website content if not already loaded
     if not st.session_state.url_loaded and website_url:
-        raw_text, error = scrape_website(website_url)
+        try:
+            with st.spinner(f"🔍 WebWhisper is analyzing {website_url}..."):
+                cleaned_context = fetch_and_clean(website_url)
+            error = None
+        except RuntimeError as e:
+            cleaned_context, error = None, str(e)
         
         if error:
             st.error(f"❌ {error}")
         else:
-            cleaned_context = clean_text(raw_text)
-            
             if not cleaned_context:
                 st.error("❌ No content could be extracted from this website.")
             else:
                 st.session_state.context = cleaned_context
+                # Tokenize the context once; each turn only adds the question
+                st.session_state.prefix_ids = encode_context(cleaned_context, st.session_state.tokenizer)
                 st.session_state.url_loaded = True
                 st.success(f"✅ Successfully analyzed {len(cleaned_context)} characters from the website!")
                 
+                # Answer all example questions in one batched call so
+                # clicking one later returns instantly
+                with st.spinner("🔮 Preparing answers to example questions..."):
+                    try:
+                        # Re-analyzing the same page reuses the cached answers
+                        st.session_state.example_answers = answer_example_questions(
+                            st.session_state.prefix_ids,
+                            st.session_state.model,
+                            st.session_state.tokenizer,
+                            st.session_state.semantic_cache
+                        )
+                    except Exception:
+                        # Leave them unset so a click falls back to ask_model()
+                        st.session_state.example_answers = {}
+                
                 # Display website preview
                 with st.expander("📄 View Extracted Content Preview"):
                     st.text_area(
@@ -292,18 +894,39 @@ def main():
         
         # Display chat history
         for message in st.session_state.messages:
-            if message["role"] == "user":
-                st.markdown(f"""
-                <div class="chat-message user-message">
-                    <strong>👤 You:</strong><br>{message["content"]}
-                </div>
-                """, unsafe_allow_html=True)
-            else:
-                st.markdown(f"""
-                <div class="chat-message bot-message">
-                    <strong>🔮 WebWhisper:</strong><br>{message["content"]}
-                </div>
-                """, unsafe_allow_html=True)
+            with st.chat_message(message["role"], avatar=CHAT_AVATARS[message["role"]]):
+                st.write(message["content"])
+        
+        # New messages are rendered here, directly below the history, so no
+        # rerun is needed to show them
+        live_container = st.container()
+        
+        # Example questions with precomputed answers
+        example_question = None
+        example_cols = st.columns(len(EXAMPLE_QUESTIONS))
+        for col, (icon, question) in zip(example_cols, EXAMPLE_QUESTIONS):
+            with col:
+                if st.button(f"{icon} {question}", use_container_width=True):
+                    example_question = question
+        
+        if example_question:
+            answer = st.session_state.example_answers.get(example_question)
+            if answer is None:
+                answer = ask_model(
+                    example_question,
+                    st.session_state.prefix_ids,
+                    st.session_state.model,
+                    st.session_state.tokenizer,
+                    st.session_state.semantic_cache
+                )
+            st.session_state.messages.append({"role": "user", "content": example_question})
+            st.session_state.messages.append({"role": "assistant", "content": answer})
+            
+            with live_container:
+                with st.chat_message("user", avatar=CHAT_AVATARS["user"]):
+                    st.write(example_question)
+                with st.chat_message("assistant", avatar=CHAT_AVATARS["assistant"]):
+                    st.write(answer)
         
         # Chat input
         user_question = st.chat_input("💭 Ask me anything about this website...")
@@ -312,19 +935,25 @@ def main():
             # Add user message to history
             st.session_state.messages.append({"role": "user", "content": user_question})
             
-            # Generate response
-            with st.spinner("🔮 WebWhisper is thinking..."):
-                answer = ask_model(
-                    user_question,
-                    st.session_state.context,
-                    st.session_state.model
-                )
+            with live_container:
+                with st.chat_message("user", avatar=CHAT_AVATARS["user"]):
+                    st.write(user_question)
+                
+                # Stream the response as it is generated
+                with st.chat_message("assistant", avatar=CHAT_AVATARS["assistant"]):
+                    placeholder = st.empty()
+                    answer = ""
+                    for answer in stream_answer(
+                        user_question,
+                        st.session_state.prefix_ids,
+                        st.session_state.model,
+                        st.session_state.tokenizer,
+                        st.session_state.semantic_cache
+                    ):
+                        placeholder.write(answer)
             
             # Add bot response to history
             st.session_state.messages.append({"role": "assistant", "content": answer})
-            
-            # Rerun to display new messages
-            st.rerun()
         
         # Action buttons
         if st.session_state.messages:
@@ -345,54 +974,15 @@ def main():
         col1, col2 = st.columns([1, 1])
         
         with col1:
-            st.markdown("""
-            <div class="info-box">
-                <h3>🚀 How to Get Started</h3>
-                <ol>
-                    <li><strong>Enter URL:</strong> Paste a website URL in the sidebar</li>
-                    <li><strong>Analyze:</strong> Click "Analyze Website" button</li>
-                    <li><strong>Chat:</strong> Ask questions about the content!</li>
-                </ol>
-                <p><em>WebWhisper will extract and understand the website content for you.</em></p>
-            </div>
-            """, unsafe_allow_html=True)
-            
-            st.markdown("### 💡 Example Questions")
-            example_questions = [
-                "🔍 What is this website about?",
-                "📋 What services are offered?",
-                "⭐ What are the main features?",
-                "💼 Who is the target audience?",
-                "🎯 What problems does it solve?",
-            ]
-            
-            for question in example_questions:
-                st.markdown(f"- {question}")
+            st.markdown(GET_STARTED_HTML, unsafe_allow_html=True)
         
         with col2:
-            st.markdown("""
-            <div class="info-box" style="background-color: #e8f5e9; border-left-color: #4caf50;">
-                <h3>🎯 Why WebWhisper AI?</h3>
-                <ul>
-                    <li><strong>Instant Understanding:</strong> Quickly grasp website content</li>
-                    <li><strong>Smart Analysis:</strong> AI-powered insights</li>
-                    <li><strong>Save Time:</strong> No need to read entire websites</li>
-                    <li><strong>Ask Anything:</strong> Natural language Q&A</li>
-                </ul>
-            </div>
-            """, unsafe_allow_html=True)
-            
-            st.markdown("""
-            <div class="info-box" style="background-color: #e3f2fd; border-left-color: #2196f3;">
-                <h3>🔧 Technical Stack</h3>
-                <ul>
-                    <li>🤖 <strong>NLP:</strong> FLAN-T5 (Hugging Face)</li>
-                    <li>🕷️ <strong>Scraping:</strong> BeautifulSoup4</li>
-                    <li>🎨 <strong>Interface:</strong> Streamlit</li>
-                    <li>🐍 <strong>Language:</strong> Python 3.8+</li>
-                </ul>
-            </div>
-            """, unsafe_allow_html=True)
+            st.markdown(WELCOME_HTML + STACK_HTML, unsafe_allow_html=True)
+    
+    # Drawn last so the message count includes this run's exchange
+    if st.session_state.context:
+        with stats_placeholder.container():
+            render_stats()
 
 
 if __name__ == "__main__":